@@ -15,45 +15,157 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import random
+import threading
 import time
+from collections import deque
+from queue import Queue, Empty
 
 from thrift.Thrift import TException
 from thrift.protocol import TCompactProtocol, TBinaryProtocol
 from thrift.transport import TSocket, TTransport
 
 from iotdb.ainode.config import AINodeDescriptor
-from iotdb.ainode.constant import TSStatusCode
+from iotdb.ainode.constant import (TSStatusCode, DEFAULT_CLIENT_POOL_SIZE, DEFAULT_CLIENT_MAX_IDLE_TIME_S,
+                                   DEFAULT_CONNECT_TIMEOUT_MS)
 from iotdb.ainode.log import Logger
 from iotdb.ainode.util.decorator import singleton
 from iotdb.ainode.util.status import verify_success
-from iotdb.thrift.common.ttypes import TEndPoint, TSStatus, TAINodeLocation, TAINodeConfiguration
+from iotdb.thrift.common.ttypes import (TEndPoint, TSStatus, TAINodeLocation, TAINodeConfiguration,
+                                       TConfigNodeLocation)
 from iotdb.thrift.confignode import IConfigNodeRPCService
 from iotdb.thrift.confignode.ttypes import (TAINodeRemoveReq, TNodeVersionInfo,
                                             TAINodeRegisterReq, TAINodeRestartReq)
 
+try:
+    # C extension used by the accelerated protocols to (de)serialize a whole struct natively
+    from thrift.protocol import fastbinary
+except ImportError:
+    fastbinary = None
+
 logger = Logger()
 
 
 @singleton
 class ClientManager(object):
     def __init__(self):
+        if fastbinary is None:
+            logger.warning("The C extension of thrift is not available, Thrift messages will be serialized in pure "
+                           "Python, which is much slower. Please reinstall thrift with a C compiler available.")
         self._config_node_endpoint = AINodeDescriptor().get_config().get_ain_target_config_node_list()
+        self._thrift_compression_enabled = AINodeDescriptor().get_config().get_ain_thrift_compression_enabled()
+        # shared by all the clients, set on shutdown to stop the retries of the clients in use
+        self._shutdown = threading.Event()
+        self._config_node_client_pool = ClientPool(
+            lambda: ConfigNodeClient(config_leader=self._config_node_endpoint,
+                                     thrift_compression_enabled=self._thrift_compression_enabled,
+                                     shutdown=self._shutdown))
 
     def borrow_config_node_client(self):
-        return ConfigNodeClient(config_leader=self._config_node_endpoint)
+        """
+        Returns a context manager which yields an idle ConfigNodeClient and gives it back to the pool on exit, e.g.
+
+            with ClientManager().borrow_config_node_client() as client:
+                client.node_remove(location)
+        """
+        return self._config_node_client_pool.borrow()
+
+    def close(self) -> None:
+        """
+        Stops the retries of all the borrowed clients and closes the idle ones, called when the AINode is stopping.
+        """
+        self._shutdown.set()
+        self._config_node_client_pool.close()
+
+
+class ClientPool(object):
+    """ A thread-safe pool of idle clients, so that a new connection is only opened when no idle one is left.
+
+    Args:
+        client_factory: function to create a new connected client
+        max_size: max number of idle clients kept in the pool, the others are closed when they are given back
+        max_idle_time_s: idle clients older than this are closed instead of being handed out, it should be shorter
+            than the connection timeout of the server (cn_connection_timeout_ms for ConfigNodes), so that no
+            connection closed by the server is handed out
+    """
+
+    def __init__(self, client_factory, max_size: int = DEFAULT_CLIENT_POOL_SIZE,
+                 max_idle_time_s: float = DEFAULT_CLIENT_MAX_IDLE_TIME_S):
+        self._client_factory = client_factory
+        self._max_size = max_size
+        self._max_idle_time_s = max_idle_time_s
+        # (client, the time it became idle), the most recently given back one is at the right
+        self._idle_clients = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def borrow(self):
+        return self.BorrowedClientContext(self)
+
+    def _take(self):
+        while True:
+            with self._lock:
+                if len(self._idle_clients) == 0:
+                    break
+                client, idle_since = self._idle_clients.pop()
+            if client.is_open() and time.monotonic() - idle_since < self._max_idle_time_s:
+                return client
+            client.close()
+        return self._client_factory()
+
+    def _give_back(self, client) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle_clients) < self._max_size:
+                self._idle_clients.append((client, time.monotonic()))
+                return
+        client.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle_clients = [client for client, _ in self._idle_clients]
+            self._idle_clients.clear()
+        for client in idle_clients:
+            client.close()
+
+    class BorrowedClientContext:
+        def __init__(self, pool):
+            self.pool = pool
+            self.client = None
+
+        def __enter__(self):
+            self.client = self.pool._take()
+            return self.client
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            if exc_type is not None and issubclass(exc_type, TException):
+                # the connection may be broken, do not hand it out again
+                self.client.close()
+            else:
+                self.pool._give_back(self.client)
 
 
 class ConfigNodeClient(object):
-    def __init__(self, config_leader: TEndPoint):
+    def __init__(self, config_leader: TEndPoint, thrift_compression_enabled: bool = None,
+                 shutdown: threading.Event = None):
         self._config_leader = config_leader
+        # the ConfigNode from the configuration, retried when no other ConfigNode is known
+        self._target_config_node = config_leader
+        if thrift_compression_enabled is None:
+            thrift_compression_enabled = AINodeDescriptor().get_config().get_ain_thrift_compression_enabled()
+        self._thrift_compression_enabled = thrift_compression_enabled
         self._config_nodes = []
-        self._cursor = 0
         self._transport = None
         self._client = None
+        # set when the AINode is stopping, to stop the retries waiting for reconnection
+        self._shutdown = shutdown if shutdown is not None else threading.Event()
 
         self._MSG_RECONNECTION_FAIL = "Fail to connect to any config node. Please check status of ConfigNodes"
-        self._RETRY_NUM = 5
-        self._RETRY_INTERVAL_MS = 1
+        # the interval doubles after each failed try, until it reaches the max one. 9 tries wait about 5.55s in
+        # total (0.05 + 0.1 + 0.2 + 0.4 + 0.8 + 1 * 4), which is enough for a ConfigNode leader election
+        self._RETRY_NUM = 9
+        self._RETRY_INTERVAL_S = 0.05
+        self._MAX_RETRY_INTERVAL_S = 1
 
         self._try_to_connect()
 
@@ -63,54 +175,127 @@ class ConfigNodeClient(object):
                 self._connect(self._config_leader)
                 return
             except TException:
-                logger.warning("The current node {} may have been down, try next node", self._config_leader)
+                logger.warning(f"The current node {self._config_leader} may have been down, try next node")
                 self._config_leader = None
 
         if self._transport is not None:
             self._transport.close()
 
-        try_host_num = 0
-        while try_host_num < len(self._config_nodes):
-            self._cursor = (self._cursor + 1) % len(self._config_nodes)
+        if len(self._config_nodes) > 0:
+            self._connect_to_first_available(self._config_nodes)
+            return
+
+        raise TException(self._MSG_RECONNECTION_FAIL)
+
+    def _connect_to_first_available(self, config_nodes: list) -> None:
+        """
+        Connects to all the given ConfigNodes at the same time and keeps the first connection that succeeds, so that
+        the nodes which are down cost one connect timeout in total instead of one each.
+        """
+        results = Queue()
+        chosen = threading.Event()
+        lock = threading.Lock()
 
-            try_endpoint = self._config_nodes[self._cursor]
+        def try_to_open(config_node: TConfigNodeLocation) -> None:
             try:
-                self._connect(try_endpoint)
-                return
-            except TException:
-                logger.warning("The current node {} may have been down, try next node", try_endpoint)
+                transport = self._open_transport(config_node.internalEndPoint)
+            except Exception:
+                # always report the failure, otherwise the caller would wait for this node until the timeout
+                transport = None
+            with lock:
+                if not chosen.is_set():
+                    results.put((config_node, transport))
+                    return
+            # a connection has been chosen already
+            if transport is not None:
+                transport.close()
 
-            try_host_num = try_host_num + 1
+        for config_node in config_nodes:
+            # daemon threads, so that a try hanging on a ConfigNode which is down does not keep the process alive
+            threading.Thread(target=try_to_open, args=(config_node,), daemon=True).start()
 
-        raise TException(self._MSG_RECONNECTION_FAIL)
+        transport = None
+        # the connects are bounded by the connect timeout, one more second is left for the threads to start
+        deadline = time.monotonic() + DEFAULT_CONNECT_TIMEOUT_MS / 1000 + 1
+        for _ in range(len(config_nodes)):
+            try:
+                config_node, transport = results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Empty:
+                logger.warning("Timed out while connecting to ConfigNodes")
+                break
+            if transport is not None:
+                break
+            logger.warning(f"The current node {config_node.internalEndPoint} may have been down, try next node")
+
+        with lock:
+            chosen.set()
+        # close the other connections which succeeded before the chosen one was taken
+        while not results.empty():
+            _, other_transport = results.get()
+            if other_transport is not None:
+                other_transport.close()
+
+        if transport is None:
+            raise TException(self._MSG_RECONNECTION_FAIL)
+        self._use_transport(transport)
 
     def _connect(self, target_config_node: TEndPoint) -> None:
-        transport = TTransport.TFramedTransport(
-            TSocket.TSocket(target_config_node.ip, target_config_node.port)
-        )
-        if not transport.isOpen():
-            try:
-                transport.open()
-            except TTransport.TTransportException as e:
-                logger.error("TTransportException: {}".format(e))
-                raise e
+        try:
+            transport = self._open_transport(target_config_node)
+        except TTransport.TTransportException as e:
+            logger.error(f"TTransportException: {e}")
+            raise e
+        self._use_transport(transport)
+
+    @staticmethod
+    def _open_transport(target_config_node: TEndPoint) -> TTransport.TTransportBase:
+        tsocket = TSocket.TSocket(target_config_node.ip, target_config_node.port)
+        # only connecting is bounded by the timeout, the RPCs are not
+        tsocket.setTimeout(DEFAULT_CONNECT_TIMEOUT_MS)
+        # buffer the socket so that the frame header and a small frame body are read by a single recv()
+        transport = TTransport.TFramedTransport(TTransport.TBufferedTransport(tsocket))
+        transport.open()
+        tsocket.setTimeout(None)
+        return transport
 
-        if AINodeDescriptor().get_config().get_ain_thrift_compression_enabled():
-            protocol = TCompactProtocol.TCompactProtocol(transport)
+    def _use_transport(self, transport: TTransport.TTransportBase) -> None:
+        # the protocol has to match cn_rpc_thrift_compression_enable of the ConfigNode, use the accelerated
+        # variants so that (de)serialization is done by the C extension when it is available
+        if self._thrift_compression_enabled:
+            protocol = TCompactProtocol.TCompactProtocolAccelerated(transport)
         else:
-            protocol = TBinaryProtocol.TBinaryProtocol(transport)
+            protocol = TBinaryProtocol.TBinaryProtocolAccelerated(transport)
+        if self._transport is not None:
+            self._transport.close()
+        self._transport = transport
         self._client = IConfigNodeRPCService.Client(protocol)
 
-    def _wait_and_reconnect(self) -> None:
-        # wait to start the next try
-        time.sleep(self._RETRY_INTERVAL_MS)
+    def is_open(self) -> bool:
+        return self._transport is not None and self._transport.isOpen()
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    def _wait_and_reconnect(self, retry_times: int) -> None:
+        # wait to start the next try, with jitter so that AINodes do not reconnect to ConfigNodes at the same time
+        interval = min(self._MAX_RETRY_INTERVAL_S, self._RETRY_INTERVAL_S * (2 ** retry_times))
+        if self._shutdown.wait(interval * random.uniform(0.5, 1.5)):
+            raise TException("AINode is stopping, stop retrying")
 
+        if self._config_leader is None and len(self._config_nodes) == 0:
+            # the other ConfigNodes are only known after registration, until then retry the configured one
+            self._config_leader = self._target_config_node
         try:
             self._try_to_connect()
         except TException:
             # can not connect to each config node
             self._sync_latest_config_node_list()
-            self._try_to_connect()
+            try:
+                self._try_to_connect()
+            except TException:
+                # the rpc fails on the closed transport in the next try, which waits and reconnects again
+                logger.warning(self._MSG_RECONNECTION_FAIL)
 
     def _sync_latest_config_node_list(self) -> None:
         # TODO
@@ -125,6 +310,33 @@ class ConfigNodeClient(object):
             return True
         return False
 
+    def _call_with_retry(self, rpc_name: str, *args, op_name: str):
+        """
+        Calls the given rpc of the ConfigNode leader, following the redirections and reconnecting on failures.
+
+        Args:
+            rpc_name: name of the method of IConfigNodeRPCService.Client
+            args: arguments of the rpc
+            op_name: name of the operation used in logs
+        Returns:
+            the response of the rpc whose status is successful
+        """
+        update_config_node_leader = self._update_config_node_leader
+        for retry_times in range(0, self._RETRY_NUM):
+            try:
+                # the client is replaced after reconnection, so it is looked up in each try
+                resp = getattr(self._client, rpc_name)(*args)
+                status = resp if isinstance(resp, TSStatus) else resp.status
+                if not update_config_node_leader(status):
+                    verify_success(status, f"An error occurs when calling {op_name}()")
+                    return resp
+            except TException:
+                logger.warning(f"Failed to connect to ConfigNode {self._config_leader} from AINode when executing "
+                               f"{op_name}()")
+                self._config_leader = None
+            self._wait_and_reconnect(retry_times)
+        raise TException(self._MSG_RECONNECTION_FAIL)
+
     def node_register(self, cluster_name: str, configuration: TAINodeConfiguration,
                       version_info: TNodeVersionInfo) -> int:
         req = TAINodeRegisterReq(
@@ -132,21 +344,9 @@ class ConfigNodeClient(object):
             aiNodeConfiguration=configuration,
             versionInfo=version_info
         )
-
-        for _ in range(0, self._RETRY_NUM):
-            try:
-                resp = self._client.registerAINode(req)
-                if not self._update_config_node_leader(resp.status):
-                    verify_success(resp.status, "An error occurs when calling node_register()")
-                    self._config_nodes = resp.configNodeList
-                    return resp.aiNodeId
-            except TTransport.TException:
-                logger.warning("Failed to connect to ConfigNode {} from AINode when executing node_register()",
-                               self._config_leader)
-                self._config_leader = None
-            self._wait_and_reconnect()
-
-        raise TException(self._MSG_RECONNECTION_FAIL)
+        resp = self._call_with_retry("registerAINode", req, op_name="node_register")
+        self._config_nodes = resp.configNodeList
+        return resp.aiNodeId
 
     def node_restart(self, cluster_name: str, configuration: TAINodeConfiguration,
                      version_info: TNodeVersionInfo) -> None:
@@ -155,50 +355,16 @@ class ConfigNodeClient(object):
             aiNodeConfiguration=configuration,
             versionInfo=version_info
         )
-
-        for _ in range(0, self._RETRY_NUM):
-            try:
-                resp = self._client.restartAINode(req)
-                if not self._update_config_node_leader(resp.status):
-                    verify_success(resp.status, "An error occurs when calling node_restart()")
-                    self._config_nodes = resp.configNodeList
-                    return resp.status
-            except TTransport.TException:
-                logger.warning("Failed to connect to ConfigNode {} from AINode when executing node_restart()",
-                               self._config_leader)
-                self._config_leader = None
-            self._wait_and_reconnect()
-
-        raise TException(self._MSG_RECONNECTION_FAIL)
+        resp = self._call_with_retry("restartAINode", req, op_name="node_restart")
+        self._config_nodes = resp.configNodeList
+        return resp.status
 
     def node_remove(self, location: TAINodeLocation):
         req = TAINodeRemoveReq(
             aiNodeLocation=location
         )
-        for _ in range(0, self._RETRY_NUM):
-            try:
-                status = self._client.removeAINode(req)
-                if not self._update_config_node_leader(status):
-                    verify_success(status, "An error occurs when calling node_restart()")
-                    return status
-            except TTransport.TException:
-                logger.warning("Failed to connect to ConfigNode {} from AINode when executing node_remove()",
-                               self._config_leader)
-                self._config_leader = None
-            self._wait_and_reconnect()
-        raise TException(self._MSG_RECONNECTION_FAIL)
+        return self._call_with_retry("removeAINode", req, op_name="node_remove")
 
     def get_ainode_configuration(self, node_id: int) -> map:
-        for _ in range(0, self._RETRY_NUM):
-            try:
-                resp = self._client.getAINodeConfiguration(node_id)
-                if not self._update_config_node_leader(resp.status):
-                    verify_success(resp.status, "An error occurs when calling get_ainode_configuration()")
-                    return resp.aiNodeConfigurationMap
-            except TTransport.TException:
-                logger.warning("Failed to connect to ConfigNode {} from AINode when executing "
-                               "get_ainode_configuration()",
-                               self._config_leader)
-                self._config_leader = None
-            self._wait_and_reconnect()
-        raise TException(self._MSG_RECONNECTION_FAIL)
+        return self._call_with_retry("getAINodeConfiguration", node_id,
+                                     op_name="get_ainode_configuration").aiNodeConfigurationMap
@@ -59,6 +59,9 @@ DEFAULT_CHUNK_SIZE = 8192
 
 DEFAULT_RECONNECT_TIMEOUT = 20
 DEFAULT_RECONNECT_TIMES = 3
+DEFAULT_CLIENT_POOL_SIZE = 4
+DEFAULT_CLIENT_MAX_IDLE_TIME_S = 30
+DEFAULT_CONNECT_TIMEOUT_MS = 5000
 
 STD_LEVEL = logging.INFO
 
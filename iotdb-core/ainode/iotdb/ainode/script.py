@@ -69,10 +69,11 @@ def start_ainode():
         # If the system.properties file does not exist, the AINode will register to ConfigNode.
         try:
             logger.info('IoTDB-AINode is registering to ConfigNode...')
-            ainode_id = ClientManager().borrow_config_node_client().node_register(
-                AINodeDescriptor().get_config().get_cluster_name(),
-                _generate_configuration(),
-                _generate_version_info())
+            with ClientManager().borrow_config_node_client() as client:
+                ainode_id = client.node_register(
+                    AINodeDescriptor().get_config().get_cluster_name(),
+                    _generate_configuration(),
+                    _generate_version_info())
             AINodeDescriptor().get_config().set_ainode_id(ainode_id)
             system_properties = {
                 'ainode_id': ainode_id,
@@ -95,10 +96,11 @@ def start_ainode():
         # If the system.properties file does exist, the AINode will just restart.
         try:
             logger.info('IoTDB-AINode is restarting...')
-            ClientManager().borrow_config_node_client().node_restart(
-                AINodeDescriptor().get_config().get_cluster_name(),
-                _generate_configuration(),
-                _generate_version_info())
+            with ClientManager().borrow_config_node_client() as client:
+                client.node_restart(
+                    AINodeDescriptor().get_config().get_cluster_name(),
+                    _generate_configuration(),
+                    _generate_version_info())
 
         except Exception as e:
             logger.error('IoTDB-AINode failed to restart: {}'.format(e))
@@ -123,8 +125,8 @@ def remove_ainode(arguments):
     # Delete the node with a given id
     elif len(arguments) == 3:
         target_ainode_id = int(arguments[2])
-        ainode_configuration_map = ClientManager().borrow_config_node_client().get_ainode_configuration(
-            target_ainode_id)
+        with ClientManager().borrow_config_node_client() as client:
+            ainode_configuration_map = client.get_ainode_configuration(target_ainode_id)
 
         end_point = ainode_configuration_map[target_ainode_id].location.internalEndPoint
         target_rpc_address = end_point.ip
@@ -139,7 +141,8 @@ def remove_ainode(arguments):
         raise MissingConfigError("Invalid command")
 
     location = TAINodeLocation(target_ainode_id, TEndPoint(target_rpc_address, target_rpc_port))
-    status = ClientManager().borrow_config_node_client().node_remove(location)
+    with ClientManager().borrow_config_node_client() as client:
+        status = client.node_remove(location)
 
     if status.code == TSStatusCode.SUCCESS_STATUS.get_status_code():
         logger.info('IoTDB-AINode has successfully removed.')
@@ -38,9 +38,9 @@ class RPCService(threading.Thread):
                                           port=AINodeDescriptor().get_config().get_ain_inference_rpc_port())
         transport_factory = TTransport.TFramedTransportFactory()
         if AINodeDescriptor().get_config().get_ain_thrift_compression_enabled():
-            protocol_factory = TCompactProtocol.TCompactProtocolFactory()
+            protocol_factory = TCompactProtocol.TCompactProtocolAcceleratedFactory()
         else:
-            protocol_factory = TBinaryProtocol.TBinaryProtocolFactory()
+            protocol_factory = TBinaryProtocol.TBinaryProtocolAcceleratedFactory()
 
         self.__pool_server = TServer.TThreadPoolServer(processor, transport, transport_factory, protocol_factory)
 
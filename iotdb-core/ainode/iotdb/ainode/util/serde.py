@@ -129,29 +129,23 @@ def convert_to_df(name_list, type_list, name_index, binary_list):
                     TSDataType[type_list[i]]
                 )
 
-    binary_size = len(binary_list)
-    binary_index = 0
-    result = {}
-    for column_name in column_name_list:
-        result[column_name] = None
-
-    while binary_index < binary_size:
-        buffer = binary_list[binary_index]
-        binary_index += 1
-        time_column_values, column_values, null_indicators, _ = deserialize(buffer)
-        time_array = np.frombuffer(
-            time_column_values, np.dtype(np.longlong).newbyteorder(">")
-        )
-        if time_array.dtype.byteorder == ">":
-            time_array = time_array.byteswap().newbyteorder("<")
-
-        if result[TIMESTAMP_STR] is None:
-            result[TIMESTAMP_STR] = time_array
-        else:
-            result[TIMESTAMP_STR] = np.concatenate(
-                (result[TIMESTAMP_STR], time_array), axis=0
-            )
-        total_length = len(time_array)
+    blocks = [deserialize(buffer) for buffer in binary_list]
+    total_length = sum(position_count for _, _, _, position_count in blocks)
+
+    # allocate every column once for the rows of all tsBlocks, then fill each tsBlock in at its offset
+    result = {TIMESTAMP_STR: np.empty(total_length, np.int64)}
+    null_masks = {}
+    for column_name in column_name_list[1:]:
+        location = column_ordinal_dict[column_name] - START_INDEX
+        if location < 0 or column_name in result:
+            continue
+        result[column_name] = np.empty(total_length, _get_native_dtype(column_type_deduplicated_list[location]))
+        null_masks[column_name] = np.zeros(total_length, dtype=bool)
+
+    offset = 0
+    for time_column_values, column_values, null_indicators, position_count in blocks:
+        end = offset + position_count
+        result[TIMESTAMP_STR][offset:end] = np.frombuffer(time_column_values, TSDataType.INT64.np_dtype())
 
         for i in range(len(column_values)):
             column_name = column_name_list[i + 1]
@@ -162,99 +156,49 @@ def convert_to_df(name_list, type_list, name_index, binary_list):
 
             data_type = column_type_deduplicated_list[location]
             value_buffer = column_values[location]
-            value_buffer_len = len(value_buffer)
 
-            if data_type == TSDataType.DOUBLE:
-                data_array = np.frombuffer(
-                    value_buffer, np.dtype(np.double).newbyteorder(">")
-                )
-            elif data_type == TSDataType.FLOAT:
-                data_array = np.frombuffer(
-                    value_buffer, np.dtype(np.float32).newbyteorder(">")
-                )
+            if data_type == TSDataType.DOUBLE or data_type == TSDataType.FLOAT \
+                    or data_type == TSDataType.INT32 or data_type == TSDataType.INT64:
+                data_array = np.frombuffer(value_buffer, data_type.np_dtype())
             elif data_type == TSDataType.BOOLEAN:
-                data_array = []
-                for index in range(len(value_buffer)):
-                    data_array.append(value_buffer[index])
-                data_array = np.array(data_array).astype("bool")
-            elif data_type == TSDataType.INT32:
-                data_array = np.frombuffer(
-                    value_buffer, np.dtype(np.int32).newbyteorder(">")
-                )
-            elif data_type == TSDataType.INT64:
-                data_array = np.frombuffer(
-                    value_buffer, np.dtype(np.int64).newbyteorder(">")
-                )
+                data_array = value_buffer
             elif data_type == TSDataType.TEXT:
-                index = 0
-                data_array = []
-                while index < value_buffer_len:
-                    value_bytes = value_buffer[index]
-                    value = value_bytes.decode("utf-8")
-                    data_array.append(value)
-                    index += 1
-                data_array = np.array(data_array, dtype=object)
+                data_array = np.array([value_bytes.decode("utf-8") for value_bytes in value_buffer], dtype=object)
             else:
                 raise RuntimeError("unsupported data type {}.".format(data_type))
 
-            if data_array.dtype.byteorder == ">":
-                data_array = data_array.byteswap().newbyteorder("<")
-
+            column = result[column_name][offset:end]
             null_indicator = null_indicators[location]
-            if len(data_array) < total_length or (data_type == TSDataType.BOOLEAN and null_indicator is not None):
-                if data_type == TSDataType.INT32 or data_type == TSDataType.INT64:
-                    tmp_array = np.full(total_length, np.nan, np.float32)
-                elif data_type == TSDataType.FLOAT or data_type == TSDataType.DOUBLE:
-                    tmp_array = np.full(total_length, np.nan, data_array.dtype)
-                elif data_type == TSDataType.BOOLEAN:
-                    tmp_array = np.full(total_length, np.nan, np.float32)
-                elif data_type == TSDataType.TEXT:
-                    tmp_array = np.full(total_length, np.nan, dtype=data_array.dtype)
-                else:
-                    raise Exception("Unsupported dataType in deserialization")
-
-                if null_indicator is not None:
-                    indexes = [not v for v in null_indicator]
-                    if data_type == TSDataType.BOOLEAN:
-                        tmp_array[indexes] = data_array[indexes]
-                    else:
-                        tmp_array[indexes] = data_array
-
-                if data_type == TSDataType.INT32:
-                    tmp_array = pd.Series(tmp_array).astype("Int32")
-                elif data_type == TSDataType.INT64:
-                    tmp_array = pd.Series(tmp_array).astype("Int64")
-                elif data_type == TSDataType.BOOLEAN:
-                    tmp_array = pd.Series(tmp_array).astype("boolean")
-
-                data_array = tmp_array
-
-            if result[column_name] is None:
-                result[column_name] = data_array
+            if null_indicator is None or data_type == TSDataType.BOOLEAN:
+                # boolean column holds a value for each position even if it is null
+                column[:] = data_array
             else:
-                if isinstance(result[column_name], pd.Series):
-                    if not isinstance(data_array, pd.Series):
-                        if data_type == TSDataType.INT32:
-                            data_array = pd.Series(data_array).astype("Int32")
-                        elif data_type == TSDataType.INT64:
-                            data_array = pd.Series(data_array).astype("Int64")
-                        elif data_type == TSDataType.BOOLEAN:
-                            data_array = pd.Series(data_array).astype("boolean")
-                        else:
-                            raise RuntimeError("Series Error")
-                    result[column_name] = result[column_name].append(data_array)
-                else:
-                    result[column_name] = np.concatenate(
-                        (result[column_name], data_array), axis=0
-                    )
-    for k, v in result.items():
-        if v is None:
-            result[k] = []
+                column[~null_indicator] = data_array
+            if null_indicator is not None:
+                null_masks[column_name][offset:end] = null_indicator
+        offset = end
+
+    for column_name, null_mask in null_masks.items():
+        if not null_mask.any():
+            continue
+        data_type = column_type_deduplicated_list[column_ordinal_dict[column_name] - START_INDEX]
+        if data_type == TSDataType.INT32 or data_type == TSDataType.INT64:
+            result[column_name] = pd.arrays.IntegerArray(result[column_name], null_mask)
+        elif data_type == TSDataType.BOOLEAN:
+            result[column_name] = pd.arrays.BooleanArray(result[column_name], null_mask)
+        else:
+            result[column_name][null_mask] = np.nan
     df = pd.DataFrame(result)
     df = df.reset_index(drop=True)
     return df
 
 
+def _get_native_dtype(data_type: TSDataType):
+    if data_type == TSDataType.TEXT:
+        return np.dtype(object)
+    return data_type.np_dtype().newbyteorder("=")
+
+
 def _get_encoder(data_type: pd.Series):
     if data_type == "bool":
         return b'\x00'
@@ -292,6 +236,8 @@ def _get_type_in_byte(data_type: pd.Series):
 #    +-------------+---------------+---------+------------+-----------+----------+
 
 def deserialize(buffer):
+    # slicing a memoryview does not copy, so the remaining buffer is not copied after every read
+    buffer = memoryview(buffer)
     value_column_count, buffer = read_int_from_buffer(buffer)
     data_types, buffer = read_column_types(buffer, value_column_count)
 
@@ -418,7 +364,7 @@ def read_int64_column(buffer, data_type, position_count):
     if null_indicators is None:
         size = position_count
     else:
-        size = null_indicators.count(False)
+        size = position_count - np.count_nonzero(null_indicators)
 
     if TSDataType.INT64 == data_type or TSDataType.DOUBLE == data_type:
         values, buffer = read_from_buffer(buffer, size * 8)
@@ -439,7 +385,7 @@ def read_int32_column(buffer, data_type, position_count):
     if null_indicators is None:
         size = position_count
     else:
-        size = null_indicators.count(False)
+        size = position_count - np.count_nonzero(null_indicators)
 
     if TSDataType.INT32 == data_type or TSDataType.FLOAT == data_type:
         values, buffer = read_from_buffer(buffer, size * 4)
@@ -465,32 +411,8 @@ def read_byte_column(buffer, data_type, position_count):
 
 def deserialize_from_boolean_array(buffer, size):
     packed_boolean_array, buffer = read_from_buffer(buffer, (size + 7) // 8)
-    current_byte = 0
-    output = [None] * size
-    position = 0
-    # read null bits 8 at a time
-    while position < (size & ~0b111):
-        value = packed_boolean_array[current_byte]
-        output[position] = ((value & 0b1000_0000) != 0)
-        output[position + 1] = ((value & 0b0100_0000) != 0)
-        output[position + 2] = ((value & 0b0010_0000) != 0)
-        output[position + 3] = ((value & 0b0001_0000) != 0)
-        output[position + 4] = ((value & 0b0000_1000) != 0)
-        output[position + 5] = ((value & 0b0000_0100) != 0)
-        output[position + 6] = ((value & 0b0000_0010) != 0)
-        output[position + 7] = ((value & 0b0000_0001) != 0)
-
-        position += 8
-        current_byte += 1
-    # read last null bits
-    if (size & 0b111) > 0:
-        value = packed_boolean_array[-1]
-        mask = 0b1000_0000
-        position = size & ~0b111
-        while position < size:
-            output[position] = ((value & mask) != 0)
-            mask >>= 1
-            position += 1
+    # bits are packed from the most significant one
+    output = np.unpackbits(np.frombuffer(packed_boolean_array, np.uint8), count=size).astype(bool)
     return output, buffer
 
 
@@ -516,12 +438,12 @@ def read_binary_column(buffer, data_type, position_count):
     if null_indicators is None:
         size = position_count
     else:
-        size = null_indicators.count(False)
+        size = position_count - np.count_nonzero(null_indicators)
     values = [None] * size
     for i in range(size):
         length, buffer = read_int_from_buffer(buffer)
         res, buffer = read_from_buffer(buffer, length)
-        values[i] = res
+        values[i] = bytes(res)
     return values, null_indicators, buffer
 
 
@@ -551,14 +473,15 @@ def read_run_length_column(buffer, data_type, position_count):
     encoding, buffer = read_byte_from_buffer(buffer)
     column, null_indicators, buffer = read_column(encoding, buffer, data_type, 1)
 
-    return repeat(column, data_type, position_count), null_indicators * position_count, buffer
+    if null_indicators is not None:
+        null_indicators = np.repeat(null_indicators, position_count)
+    return repeat(column, data_type, position_count), null_indicators, buffer
 
 
 def repeat(buffer, data_type, position_count):
-    if data_type == TSDataType.BOOLEAN or data_type == TSDataType.TEXT:
+    if data_type == TSDataType.BOOLEAN:
+        return np.repeat(buffer, position_count)
+    elif data_type == TSDataType.TEXT:
         return buffer * position_count
     else:
-        res = bytes(0)
-        for _ in range(position_count):
-            res.join(buffer)
-        return res
+        return bytes(buffer) * position_count